@@ -1,44 +1,224 @@
 import sys
-import yfinance as yf
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout
-from PyQt5.QtCore import QTimer, Qt, QObject, QThread, pyqtSignal
-from PyQt5.QtGui import QFont, QPalette, QColor
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+from PyQt5.QtCore import QElapsedTimer, QEvent, QPointF, QRect, QTimer, Qt, QUrl, QUrlQuery
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+from PyQt5.QtGui import QFont, QFontMetrics, QPainter, QPalette, QColor, QStaticText, QTransform
 
-# Worker class for fetching stock data in a separate thread
-class Worker(QObject):
-    finished = pyqtSignal(dict, dict)
+try:
+    from .ticker_render import visible_segments
+except ImportError:
+    # Run as a script from tick/, so there is no parent package
+    from ticker_render import visible_segments
 
-    def __init__(self, tickers):
-        super().__init__()
-        self.tickers = tickers
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the kernels below simply run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# color_map stores one uint8 index into this palette per character
+PALETTE = ('white', 'green', 'red', 'grey')
+WHITE, GREEN, RED, GREY = range(len(PALETTE))
+
+# Classify each quote as missing (white), rising (green) or falling (red)
+@njit(cache=True)
+def quote_colors(prices, changes):
+    n = prices.shape[0]
+    colors = np.empty(n, np.uint8)
+    for i in range(n):
+        if np.isnan(prices[i]) or np.isnan(changes[i]):
+            colors[i] = WHITE
+        elif changes[i] >= 0:
+            colors[i] = GREEN
+        else:
+            colors[i] = RED
+    return colors
+
+# Quote text for one ticker, bound once so refreshes go straight to C-level % formatting
+QUOTE_FORMAT = " $%.2f %s%.2f%% ".__mod__
+
+# Yahoo serves at most ~20 symbols per request, so larger lists are fetched in parallel shards
+SHARD_SIZE = 20
+
+def shard_tickers(tickers, size=SHARD_SIZE):
+    return [tickers[i:i + size] for i in range(0, len(tickers), size)]
+
+# Yahoo's spark endpoint returns daily closes for a batch of symbols in one request
+SPARK_URL = 'https://query1.finance.yahoo.com/v7/finance/spark'
+
+def spark_request(tickers):
+    url = QUrl(SPARK_URL)
+    query = QUrlQuery()
+    query.addQueryItem('symbols', ','.join(tickers))
+    query.addQueryItem('range', '2d')
+    query.addQueryItem('interval', '1d')
+    url.setQuery(query)
+
+    request = QNetworkRequest(url)
+    request.setRawHeader(b'User-Agent', b'Mozilla/5.0')
+    request.setAttribute(QNetworkRequest.HttpPipeliningAllowedAttribute, True)
+    # Remember which shard this is so the reply handler can account for all of its symbols
+    request.setAttribute(QNetworkRequest.User, list(tickers))
+    return request
+
+def parse_spark(payload):
+    new_prices = {}
+    new_changes = {}
+
+    # The last daily close is today's (live) price and the one before it is the previous close
+    for result in json_loads(payload)['spark']['result']:
+        symbol = result['symbol']
+        closes = result['response'][0]['indicators']['quote'][0]['close']
+        prev_close, current_price = closes[-2:] if len(closes) >= 2 else (None, None)
+        if current_price is not None and prev_close:
+            new_prices[symbol] = current_price
+            new_changes[symbol] = (current_price / prev_close - 1) * 100
+        else:
+            new_prices[symbol] = None
+            new_changes[symbol] = None
+
+    return new_prices, new_changes
+
+# Per-frame scroll/paint state; slots give the 20 Hz path fixed-offset attribute access
+class TickerState:
+    __slots__ = ('segments', 'offsets', 'widths', 'total_width', 'scroll_pos')
+
+    def __init__(self):
+        self.segments = [] # (QStaticText, QColor) for each color run
+        self.offsets = [] # x offset of each segment within the strip
+        self.widths = []
+        self.total_width = 0
+        self.scroll_pos = 0.0 # In (fractional) pixels
+
+# Paints the ticker text directly from pre-laid-out segments instead of reparsing rich text
+class TickerWidget(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.state = TickerState()
+        self.layout_cache = {} # fragment -> (QStaticText, width), reused across refreshes
+        self.text = ""
+        self.runs = [] # (color, start, length) for each run of same-colored characters
+        self.scroll_speed = 0.0 # Pixels per second, derived from the font
+
+        # Scratch geometry and draw buffers reused by every frame, so steady-state scrolling
+        # builds no per-frame containers; the buffers grow only when the layout or size does
+        self.text_band = QRect()
+        self.draw_point = QPointF()
+        self.draw_indices = []
+        self.draw_lefts = []
+        self.apply_font()
+
+    def set_runs(self, text, runs):
+        self.text = text
+        self.runs = runs
+        metrics = QFontMetrics(self.font())
+        layout_cache = {}
+        segments = []
+        offsets = []
+        widths = []
+        x = 0
+        for color, start, length in runs:
+            fragment = text[start:start + length]
+            # Unchanged fragments (labels, separators) keep their already laid-out text
+            layout = layout_cache.get(fragment) or self.layout_cache.get(fragment)
+            if layout is None:
+                layout = (self.prepare_static_text(fragment), metrics.horizontalAdvance(fragment))
+            layout_cache[fragment] = layout
+            static_text, width = layout
+            segments.append((static_text, QColor(color)))
+            offsets.append(float(x))
+            widths.append(float(width))
+            x += width
+        self.state.segments = segments
+        self.state.offsets = offsets
+        self.state.widths = widths
+        self.state.total_width = x
+        self.layout_cache = layout_cache
+        self.ensure_draw_buffers()
+        self.update()
+
+    def prepare_static_text(self, fragment):
+        static_text = QStaticText(fragment)
+        # Fragments are never markup, so skip Qt's rich-text detection, and shape the
+        # glyphs now rather than on the first paint that shows them
+        static_text.setTextFormat(Qt.PlainText)
+        static_text.setPerformanceHint(QStaticText.AggressiveCaching)
+        static_text.prepare(QTransform(), self.font())
+        return static_text
+
+    def update_text_band(self):
+        text_height = QFontMetrics(self.font()).height()
+        self.text_band.setRect(0, (self.height() - text_height) // 2, self.width(), text_height)
+
+    def ensure_draw_buffers(self):
+        # Each repetition of the strip can show every segment once, and the view spans
+        # at most width / total_width repetitions plus a partial one at each end
+        state = self.state
+        if not state.total_width:
+            return
+        size = len(state.segments) * (int(self.width() // state.total_width) + 2)
+        if len(self.draw_indices) < size:
+            self.draw_indices = [0] * size
+            self.draw_lefts = [0.0] * size
 
-    def get_stock_prices_and_changes(self):
-        try:
-            data = yf.download(self.tickers, period='1d', interval='1m')
-            history = yf.download(self.tickers, period='2d', interval='1d')
-            
-            new_prices = {}
-            new_changes = {}
-            
-            if not data.empty and not history.empty:
-                for ticker in self.tickers:
-                    current_price_series = data['Close'][ticker]
-                    current_price = current_price_series.iloc[-1] if not current_price_series.empty else None
-                    new_prices[ticker] = current_price
-                    
-                    prev_close_series = history['Close'][ticker]
-                    prev_close = prev_close_series.iloc[-2] if len(prev_close_series) >= 2 else None
-                    
-                    if current_price is not None and prev_close is not None and prev_close != 0:
-                        percentage_change = ((current_price - prev_close) / prev_close) * 100
-                        new_changes[ticker] = percentage_change
-                    else:
-                        new_changes[ticker] = None
-                        
-            self.finished.emit(new_prices, new_changes)
-        except Exception as e:
-            print(f"Error fetching stock data: {e}")
-            self.finished.emit({}, {})
+    def resizeEvent(self, event):
+        self.update_text_band()
+        self.ensure_draw_buffers()
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange:
+            self.apply_font()
+        super().changeEvent(event)
+
+    def apply_font(self):
+        # Everything shaped or measured with the previous font is stale
+        self.scroll_speed = QFontMetrics(self.font()).averageCharWidth() * 5 # Five average characters
+        self.update_text_band()
+        self.layout_cache = {}
+
+        state = self.state
+        old_width = state.total_width
+        self.set_runs(self.text, self.runs)
+        if old_width and state.total_width:
+            # Keep roughly the same text in view under the new metrics
+            state.scroll_pos *= state.total_width / old_width
+
+    def scroll_by(self, dx):
+        state = self.state
+        state.scroll_pos = (state.scroll_pos + dx) % state.total_width
+        # Only the text band changes between frames
+        self.update(self.text_band)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setFont(self.font())
+
+        state = self.state
+        if not state.segments:
+            painter.setPen(QColor('white'))
+            painter.drawText(self.rect(), Qt.AlignCenter, "Loading data...")
+            return
+
+        point = self.draw_point
+        point.setY(self.text_band.top())
+        segments = state.segments
+        indices = self.draw_indices
+        lefts = self.draw_lefts
+        count = visible_segments(state.offsets, state.widths, state.scroll_pos,
+                                 state.total_width, self.width(), indices, lefts)
+        for k in range(count):
+            static_text, color = segments[indices[k]]
+            point.setX(lefts[k])
+            painter.setPen(color)
+            painter.drawStaticText(point, static_text)
 
 class StockTickerApp(QWidget):
     def __init__(self, tickers):
@@ -47,11 +227,24 @@ class StockTickerApp(QWidget):
         self.prices = {}
         self.daily_changes = {}
         self.is_updating = False # Flag to prevent multiple updates at once
+        self.shards = shard_tickers(tickers)
+        self.remaining_shards = 0
+        self.content_update_queued = False
+
+        # Labels and separators never change, so lay out the label/quote/separator pieces
+        # once and only fill in the quote slots (every third piece) on refresh
+        piece_count = max(3 * len(tickers) - 1, 0)
+        self.pieces = np.empty(piece_count, dtype=object)
+        self.pieces[0::3] = [f" {ticker}:" for ticker in tickers]
+        self.pieces[2::3] = "  |  "
+        self.piece_colors = np.full(piece_count, WHITE, dtype=np.uint8)
+        self.piece_colors[2::3] = GREY
+        self.piece_lengths = np.array([len(piece) if piece is not None else 0 for piece in self.pieces], dtype=np.intp)
 
-        self.full_plain_text = ""
-        self.color_map = []
-        self.scroll_pos = 0.0
-        self.display_length = 100
+        # Requests run asynchronously on the GUI event loop over reused keep-alive connections
+        self.network = QNetworkAccessManager(self)
+        self.network.setTransferTimeout(10000)
+        self.network.finished.connect(self.handle_reply)
         
         self.initUI()
         self.start_timers()
@@ -67,115 +260,106 @@ class StockTickerApp(QWidget):
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
 
-        self.ticker_label = QLabel("Loading data...", self)
-        self.ticker_label.setFont(QFont('Arial', 40, QFont.Bold))
-        self.ticker_label.setAlignment(Qt.AlignCenter)
-        self.ticker_label.setStyleSheet("color: #FFFFFF;")
-        main_layout.addWidget(self.ticker_label)
+        self.ticker_widget = TickerWidget(self)
+        self.ticker_widget.setFont(QFont('Arial', 40, QFont.Bold))
+        main_layout.addWidget(self.ticker_widget)
 
     def start_timers(self):
-        # Initial data fetch
-        self.is_updating = True
-        self.thread = QThread()
-        self.worker = Worker(self.tickers)
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.get_stock_prices_and_changes)
-        self.worker.finished.connect(self.handle_initial_update)
-        self.thread.start()
-
-        # The scroll timer runs continuously
+        # Initial data fetch, then refresh on a fixed interval independent of scrolling
+        self.start_update()
+        # numba compiles quote_colors on its first call; do that while the initial replies are
+        # in flight instead of stalling the first render
+        quote_colors(np.empty(0), np.empty(0))
+        self.update_timer = QTimer(self)
+        self.update_timer.timeout.connect(self.start_update)
+        self.update_timer.start(15000)
+
+        # The scroll timer runs continuously; movement is scaled by the real elapsed time
+        self.frame_clock = QElapsedTimer()
+        self.frame_clock.start()
         self.scroll_timer = QTimer(self)
         self.scroll_timer.timeout.connect(self.scroll_ticker)
         self.scroll_timer.start(50)
 
-    def start_update_thread(self):
-        if not self.is_updating:
+    def start_update(self):
+        # With no tickers there is nothing to request, so no reply would ever clear the flag
+        if self.shards and not self.is_updating:
             self.is_updating = True
-            self.thread = QThread()
-            self.worker = Worker(self.tickers)
-            self.worker.moveToThread(self.thread)
-            self.thread.started.connect(self.worker.get_stock_prices_and_changes)
-            self.worker.finished.connect(self.handle_prices_update)
-            self.thread.start()
-
-    def handle_initial_update(self, new_prices, new_changes):
-        self.prices = new_prices
-        self.daily_changes = new_changes
-        self.update_ticker_content()
-        self.is_updating = False
-        self.thread.quit()
-        self.thread.wait()
+            self.remaining_shards = len(self.shards)
+            for shard in self.shards:
+                self.network.get(spark_request(shard))
+
+    def handle_reply(self, reply):
+        # Every requested symbol is reported, as None (N/A) unless the reply has a value,
+        # so a failed or partial shard never leaves an earlier cycle's quote showing as live
+        shard = reply.request().attribute(QNetworkRequest.User)
+        new_prices = dict.fromkeys(shard)
+        new_changes = dict.fromkeys(shard)
+        if reply.error() == QNetworkReply.NoError:
+            try:
+                parsed_prices, parsed_changes = parse_spark(bytes(reply.readAll()))
+                new_prices.update(parsed_prices)
+                new_changes.update(parsed_changes)
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                print(f"Error parsing stock data: {e}")
+        else:
+            print(f"Error fetching stock data: {reply.errorString()}")
+        reply.deleteLater()
+
+        self.handle_prices_update(new_prices, new_changes)
 
     def handle_prices_update(self, new_prices, new_changes):
-        self.prices = new_prices
-        self.daily_changes = new_changes
+        # Shards arrive in completion order; show each as it lands so the first
+        # reply fills the screen without waiting for the slowest one
+        self.prices.update(new_prices)
+        self.daily_changes.update(new_changes)
+        self.schedule_ticker_update()
+
+        self.remaining_shards -= 1
+        if self.remaining_shards == 0:
+            self.is_updating = False
+
+    def schedule_ticker_update(self):
+        # Defer the rebuild to the next idle pass; back-to-back requests collapse into one
+        if not self.content_update_queued:
+            self.content_update_queued = True
+            QTimer.singleShot(0, self.flush_ticker_update)
+
+    def flush_ticker_update(self):
+        self.content_update_queued = False
         self.update_ticker_content()
-        self.is_updating = False
-        self.thread.quit()
-        self.thread.wait()
 
     def update_ticker_content(self):
-        new_full_plain_text = ""
-        new_color_map = []
-        
-        separator = "  |  "
-        separator_color = "grey"
-
-        for i, ticker in enumerate(self.tickers):
-            price = self.prices.get(ticker)
-            change = self.daily_changes.get(ticker)
-            
-            if price is not None and change is not None:
-                color = "green" if change >= 0 else "red"
-                arrow = "▲" if change >= 0 else "▼"
-                
-                text_part = f" {ticker}: ${price:.2f} {arrow}{change:.2f}% "
-                new_full_plain_text += text_part
-                
-                new_color_map.extend(['white'] * (len(ticker) + 2))
-                new_color_map.extend([color] * (len(text_part) - len(ticker) - 2))
-            else:
-                text_part = f" {ticker}: N/A "
-                new_full_plain_text += text_part
-                new_color_map.extend(['white'] * len(text_part))
-            
-            if i < len(self.tickers) - 1:
-                new_full_plain_text += separator
-                new_color_map.extend([separator_color] * len(separator))
-
-        self.full_plain_text = new_full_plain_text
-        self.color_map = new_color_map
-    
+        # Missing values become NaN so the color kernel can classify every ticker in one call
+        prices = np.array([self.prices.get(ticker) for ticker in self.tickers], dtype=float)
+        changes = np.array([self.daily_changes.get(ticker) for ticker in self.tickers], dtype=float)
+        colors = quote_colors(prices, changes)
+
+        format_quote = QUOTE_FORMAT
+        quotes = [format_quote((price, "▲" if color == GREEN else "▼", change)) if color != WHITE else " N/A "
+                  for price, change, color in zip(prices.tolist(), changes.tolist(), colors.tolist())]
+
+        self.pieces[1::3] = quotes
+        self.piece_colors[1::3] = colors
+        self.piece_lengths[1::3] = list(map(len, quotes))
+
+        new_full_plain_text = ''.join(self.pieces.tolist())
+        new_color_map = np.repeat(self.piece_colors, self.piece_lengths)
+
+        # Collapse same-colored characters into runs so each frame draws one segment per run
+        run_starts = np.flatnonzero(np.diff(new_color_map)) + 1
+        if len(new_color_map):
+            run_starts = np.concatenate(([0], run_starts))
+        run_lengths = np.diff(np.append(run_starts, len(new_color_map)))
+        runs = [(PALETTE[color], start, length) for color, start, length
+                in zip(new_color_map[run_starts].tolist(), run_starts.tolist(), run_lengths.tolist())]
+        self.ticker_widget.set_runs(new_full_plain_text, runs)
+
     def scroll_ticker(self):
-        if self.full_plain_text and self.color_map:
-            text_length = len(self.full_plain_text)
-            
-            start_pos = int(self.scroll_pos)
-            end_pos = start_pos + self.display_length
-            
-            # Check for a new cycle to trigger an update
-            if self.scroll_pos < 0.25 and not self.is_updating:
-                self.start_update_thread()
-            
-            html_parts = []
-            
-            def get_colored_char(char_index):
-                char = self.full_plain_text[char_index]
-                color = self.color_map[char_index]
-                return f"<font color='{color}'>{char}</font>"
-
-            if end_pos > text_length:
-                for i in range(start_pos, text_length):
-                    html_parts.append(get_colored_char(i))
-                for i in range(end_pos - text_length):
-                    html_parts.append(get_colored_char(i))
-            else:
-                for i in range(start_pos, end_pos):
-                    html_parts.append(get_colored_char(i))
-            
-            self.ticker_label.setText("".join(html_parts))
-            
-            self.scroll_pos = (self.scroll_pos + 0.25) % text_length
+        ticker_widget = self.ticker_widget
+        step = ticker_widget.scroll_speed * self.frame_clock.restart() / 1000
+        if ticker_widget.state.total_width:
+            ticker_widget.scroll_by(step)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
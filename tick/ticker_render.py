@@ -0,0 +1,36 @@
+# Pure, statically typed helpers for the per-frame render path. Everything here is
+# plain Python that mypyc can compile; build with `mypyc ticker_render.py` from this
+# directory and the resulting extension module is imported in place of this file.
+from bisect import bisect_right
+
+
+def visible_segments(offsets: list[float], widths: list[float], scroll_pos: float,
+                     total_width: float, view_width: float,
+                     indices: list[int], lefts: list[float]) -> int:
+    # Writes (segment index, left edge) for every segment that intersects the view into
+    # the caller-owned indices/lefts buffers, repeating the strip as often as needed to
+    # wrap around seamlessly. Returns how many entries were written; writing stops once
+    # the buffers are full
+    count = len(offsets)
+    capacity = len(indices)
+    if count == 0 or total_width <= 0:
+        return 0
+
+    written = 0
+    origin = -(scroll_pos % total_width)
+    # Skip straight to the segment under the left edge of the view
+    start = max(bisect_right(offsets, -origin) - 1, 0)
+    while origin < view_width:
+        for i in range(start, count):
+            left = origin + offsets[i]
+            if left > view_width:
+                break
+            if left + widths[i] >= 0:
+                if written == capacity:
+                    return written
+                indices[written] = i
+                lefts[written] = left
+                written += 1
+        origin += total_width
+        start = 0
+    return written